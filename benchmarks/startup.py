@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Measure decluttarr-manager cold start: process launch to first byte of / and to /readyz.
+
+Usage: python benchmarks/startup.py [runs]
+"""
+import http.client
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MANAGER = os.path.join(ROOT, 'decluttarr-manager.py')
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def poll(port, path, started, timeout=30, want_status=None):
+    """Retry GET path until it answers; return ms from launch to the response's first byte"""
+    while time.perf_counter() - started < timeout:
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+        try:
+            connection.request('GET', path)
+            response = connection.getresponse()
+            elapsed = (time.perf_counter() - started) * 1000
+            response.read()
+            if want_status is None or response.status == want_status:
+                return elapsed
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            connection.close()
+        time.sleep(0.005)
+    raise TimeoutError(f'{path} did not answer within {timeout}s')
+
+def run_once(compose_file):
+    port = free_port()
+    env = dict(os.environ, COMPOSE_FILE=compose_file, MANAGER_PORT=str(port))
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, MANAGER], env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        first_byte = poll(port, '/', started)
+        ready = poll(port, '/readyz', started, want_status=200)
+    finally:
+        process.terminate()
+        process.wait()
+    return first_byte, ready
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    with tempfile.TemporaryDirectory() as workdir:
+        compose_file = os.path.join(workdir, 'docker-compose.yml')
+        shutil.copy(os.path.join(ROOT, 'docker-compose.yml'), compose_file)
+        results = [run_once(compose_file) for _ in range(runs)]
+
+    for label, values in (('first byte of /', [r[0] for r in results]),
+                          ('/readyz ready', [r[1] for r in results])):
+        print(f"{label:>16}: median {statistics.median(values):7.1f} ms  "
+              f"min {min(values):7.1f} ms  max {max(values):7.1f} ms  ({runs} runs)")
+
+if __name__ == '__main__':
+    main()
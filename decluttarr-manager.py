@@ -1,15 +1,58 @@
 #!/usr/bin/env python3
-from flask import Flask, render_template_string, request, jsonify, redirect, url_for
+from flask import Flask, Response, abort, g, render_template, request, jsonify, redirect, url_for
 import subprocess
-import yaml
 import os
+import re
+import sys
 import json
-from datetime import datetime
+import copy
+import hashlib
+import hmac
+import zlib
+import queue
+import time
+import threading
+import itertools
+import importlib
+from collections import Counter, deque
+from datetime import datetime, timedelta
 
 app = Flask(__name__)
 
+# Startup tracking for /readyz
+BOOT_STARTED = time.monotonic()
+warmup_done = threading.Event()
+warmup_stats = {}
+warmup_lock = threading.Lock()
+
 # Configuration file path
-COMPOSE_FILE = '/docker/decluttarr/docker-compose.yml'
+COMPOSE_FILE = os.environ.get('COMPOSE_FILE', '/docker/decluttarr/docker-compose.yml')
+
+# Registry of decluttarr deployments (YAML or JSON list). Without it the manager
+# controls the single deployment in COMPOSE_FILE.
+TARGETS_FILE = os.environ.get('DECLUTTARR_TARGETS', '')
+DEFAULT_TARGET = {
+    'name': 'default',
+    'compose_file': COMPOSE_FILE,   # empty for Docker-only targets (start/stop/restart/logs)
+    'working_dir': '',              # defaults to the compose file's directory
+    'service': 'decluttarr',        # compose service name
+    'container': 'decluttarr',      # container name for status and logs
+    'docker_host': '',              # DOCKER_HOST value, e.g. tcp://nas:2375 or unix:///path/docker.sock
+    'timeout': 120,                 # seconds one operation (lifecycle action, log search) may take
+}
+
+# Status checks are polled, so they get at most this many seconds per target
+STATUS_TIMEOUT = 5
+
+# Settings history kept next to each compose file, bounded by count and age (0 disables the age limit)
+HISTORY_MAX_VERSIONS = int(os.environ.get('HISTORY_MAX_VERSIONS', '50'))
+HISTORY_MAX_AGE_DAYS = int(os.environ.get('HISTORY_MAX_AGE_DAYS', '90'))
+
+# Request profiling (disabled unless PROFILE_TOKEN is set; PROFILE_SAMPLE_EVERY adds 1-in-N sampling)
+PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN', '')
+PROFILE_SAMPLE_EVERY = int(os.environ.get('PROFILE_SAMPLE_EVERY', '0'))
+PROFILE_MAX_STORED = int(os.environ.get('PROFILE_MAX_STORED', '20'))
+PROFILE_INTERVAL_MS = float(os.environ.get('PROFILE_INTERVAL_MS', '2'))
 
 # Default settings with descriptions
 DEFAULT_SETTINGS = {
@@ -51,6 +94,18 @@ DEFAULT_SETTINGS = {
     }
 }
 
+# Flat view of DEFAULT_SETTINGS for validation
+SETTINGS_SCHEMA = {key: spec for settings in DEFAULT_SETTINGS.values() for key, spec in settings.items()}
+
+# Public form of the schema served by /api/settings/schema
+PUBLIC_SETTINGS_SCHEMA = {
+    key: dict({field: value for field, value in spec.items() if field != 'value'}, default=spec['value'])
+    for key, spec in SETTINGS_SCHEMA.items()
+}
+
+# Serializes read-modify-write cycles on the compose files
+settings_write_lock = threading.Lock()
+
 HTML_TEMPLATE = '''
 <!DOCTYPE html>
 <html>
@@ -237,6 +292,20 @@ HTML_TEMPLATE = '''
             white-space: pre-wrap;
         }
         
+        .target-select {
+            padding: 6px 10px;
+            border: 1px solid #30363d;
+            border-radius: 6px;
+            background: #0d1117;
+            color: #e6edf3;
+        }
+        .instances-table { width: 100%; border-collapse: collapse; margin-bottom: 20px; }
+        .instances-table th, .instances-table td {
+            padding: 10px;
+            border-bottom: 1px solid #30363d;
+            text-align: left;
+        }
+        
         .alert {
             padding: 15px;
             border-radius: 8px;
@@ -278,6 +347,16 @@ HTML_TEMPLATE = '''
                 <div class="status-indicator" id="containerStatus"></div>
                 <span id="statusText">Checking status...</span>
             </div>
+            {% if targets|length > 1 %}
+            <div class="status-item">
+                <strong>Instance:</strong>
+                <select class="target-select" onchange="location.href = '/?target=' + encodeURIComponent(this.value)">
+                    {% for name in targets %}
+                    <option value="{{ name }}" {% if name == target.name %}selected{% endif %}>{{ name }}</option>
+                    {% endfor %}
+                </select>
+            </div>
+            {% endif %}
             <div class="status-item">
                 <strong>Last Updated:</strong>
                 <span id="lastUpdate">Never</span>
@@ -294,12 +373,15 @@ HTML_TEMPLATE = '''
             <div class="tab active" onclick="switchTab('settings')">📋 Settings</div>
             <div class="tab" onclick="switchTab('logs')">📄 Live Logs</div>
             <div class="tab" onclick="switchTab('actions')">🔧 Actions</div>
+            {% if targets|length > 1 %}
+            <div class="tab" onclick="switchTab('instances'); refreshInstances()">🖥️ All Instances</div>
+            {% endif %}
         </div>
         
         <div class="tab-content">
             <!-- Settings Tab -->
             <div class="tab-pane active" id="settings">
-                <form method="POST" action="/save-settings">
+                <form method="POST" action="/save-settings?target={{ target.name|urlencode }}">
                     {% for category, settings in config.items() %}
                     <div class="section-title">
                         {% if category == 'general' %}🔧 General Settings
@@ -361,6 +443,7 @@ HTML_TEMPLATE = '''
                 <div class="button-group" style="margin-bottom: 20px;">
                     <button class="btn btn-primary" onclick="refreshLogs()">🔄 Refresh Logs</button>
                     <button class="btn btn-secondary" onclick="clearLogDisplay()">🗑️ Clear Display</button>
+                    <a class="btn btn-secondary" href="/api/logs/export?since=24h&format=ndjson&target={{ target.name|urlencode }}">💾 Export Logs</a>
                 </div>
                 <div class="logs-container" id="logsContainer">
                     Click "Refresh Logs" to load container logs...
@@ -396,10 +479,39 @@ HTML_TEMPLATE = '''
                     </div>
                 </div>
             </div>
+            
+            {% if targets|length > 1 %}
+            <!-- Instances Tab -->
+            <div class="tab-pane" id="instances">
+                <div class="section-title">🖥️ All Instances</div>
+                <div class="button-group" style="margin-bottom: 20px;">
+                    <button class="btn btn-primary" onclick="refreshInstances()">🔄 Refresh Status</button>
+                </div>
+                <table class="instances-table">
+                    <thead><tr><th>Instance</th><th>Status</th><th>Details</th></tr></thead>
+                    <tbody id="instancesBody"></tbody>
+                </table>
+                
+                <div class="section-title">🔍 Search Logs</div>
+                <div class="form-group button-group" style="margin-bottom: 20px;">
+                    <input type="text" id="logSearchQuery" placeholder="Text to find in all instance logs" style="flex: 1;">
+                    <button class="btn btn-primary" onclick="searchAllLogs()">🔍 Search Last Hour</button>
+                </div>
+                <div class="logs-container" id="logSearchResults">
+                    Enter a search term to look through every instance's logs...
+                </div>
+            </div>
+            {% endif %}
         </div>
     </div>
 
     <script>
+        const TARGET = {{ target.name|tojson }};
+        
+        function targetUrl(path) {
+            return path + (path.includes('?') ? '&' : '?') + 'target=' + encodeURIComponent(TARGET);
+        }
+        
         function switchTab(tabName) {
             // Hide all tab panes
             document.querySelectorAll('.tab-pane').forEach(pane => {
@@ -426,7 +538,7 @@ HTML_TEMPLATE = '''
 
         async function refreshLogs() {
             try {
-                const response = await fetch('/api/logs');
+                const response = await fetch(targetUrl('/api/logs'));
                 const data = await response.json();
                 const logsContainer = document.getElementById('logsContainer');
                 
@@ -474,7 +586,7 @@ HTML_TEMPLATE = '''
         async function restartWithSettings() {
             if (confirm('Are you sure you want to restart the decluttarr container with settings applied?\\n\\nThis will recreate the container to ensure all environment variables are updated.')) {
                 try {
-                    const response = await fetch('/api/container/restart-with-settings', { method: 'POST' });
+                    const response = await fetch(targetUrl('/api/container/restart-with-settings'), { method: 'POST' });
                     const data = await response.json();
                     alert(data.message);
                     setTimeout(checkStatus, 3000);
@@ -492,7 +604,7 @@ HTML_TEMPLATE = '''
 
         async function containerAction(action, message) {
             try {
-                const response = await fetch(`/api/container/${action}`, { method: 'POST' });
+                const response = await fetch(targetUrl(`/api/container/${action}`), { method: 'POST' });
                 const data = await response.json();
                 alert(data.message || message);
                 setTimeout(checkStatus, 2000);
@@ -506,7 +618,7 @@ HTML_TEMPLATE = '''
             testResults.innerHTML = '<div class="alert alert-warning">Testing connections...</div>';
             
             try {
-                const response = await fetch('/api/test-connections');
+                const response = await fetch(targetUrl('/api/test-connections'));
                 const data = await response.json();
                 
                 let html = '';
@@ -522,9 +634,47 @@ HTML_TEMPLATE = '''
             }
         }
 
+        async function refreshInstances() {
+            const body = document.getElementById('instancesBody');
+            try {
+                const response = await fetch('/api/targets/status');
+                const data = await response.json();
+                body.innerHTML = '';
+                for (const [name, result] of Object.entries(data.targets)) {
+                    const row = body.insertRow();
+                    row.insertCell().textContent = name;
+                    row.insertCell().textContent = result.status || 'unknown';
+                    row.insertCell().textContent = result.error || '';
+                }
+            } catch (error) {
+                body.innerHTML = '';
+                body.insertRow().insertCell().textContent = 'Error fetching status: ' + error.message;
+            }
+        }
+
+        async function searchAllLogs() {
+            const results = document.getElementById('logSearchResults');
+            const query = document.getElementById('logSearchQuery').value;
+            results.textContent = 'Searching...';
+            try {
+                const response = await fetch('/api/targets/logs/search?since=1h&q=' + encodeURIComponent(query));
+                const data = await response.json();
+                const lines = data.matches.map(record => {
+                    const time = record.timestamp ? new Date(record.timestamp).toLocaleString() : '-';
+                    return `[${time}] [${record.target}] ${record.message}`;
+                });
+                for (const [name, error] of Object.entries(data.errors)) {
+                    lines.push(`[${name}] Error: ${error}`);
+                }
+                results.textContent = lines.length ? lines.join('\n') : 'No matching log lines.';
+            } catch (error) {
+                results.textContent = 'Error searching logs: ' + error.message;
+            }
+        }
+
         async function checkStatus() {
             try {
-                const response = await fetch('/api/status');
+                const response = await fetch(targetUrl('/api/status'));
                 const data = await response.json();
                 updateStatus(data.status);
             } catch (error) {
@@ -556,39 +706,94 @@ HTML_TEMPLATE = '''
 </html>
 '''
 
-def load_current_settings():
-    """Load current settings from docker-compose.yml"""
+# Parsed compose files keyed by path, reused while (mtime, size) is unchanged
+compose_cache = {}
+compose_cache_lock = threading.Lock()
+
+def read_compose_file(path):
+    """Parse a compose file, reusing the previous parse if the file has not changed"""
+    import yaml
+    stat = os.stat(path)
+    file_key = (stat.st_mtime_ns, stat.st_size)
+    with compose_cache_lock:
+        cached = compose_cache.get(path)
+    if cached is None or cached[0] != file_key:
+        with open(path, 'r') as f:
+            cached = (file_key, yaml.safe_load(f))
+        with compose_cache_lock:
+            compose_cache[path] = cached
+    # Callers may modify the result, so never hand out the cached object
+    return copy.deepcopy(cached[1])
+
+def environment_list(env_vars):
+    """Compose `environment:` in list or mapping form, as a list of KEY=VALUE strings"""
+    if isinstance(env_vars, dict):
+        # A bare KEY (no value) passes the host's value through, in either form
+        return [key if value is None else f"{key}={value}" for key, value in env_vars.items()]
+    return list(env_vars or [])
+
+def read_environment_list(target):
+    """Read a target's service environment as KEY=VALUE strings; raises if it cannot be read"""
+    if not target['compose_file']:
+        raise LookupError(f"Target {target['name']} has no compose_file")
+    compose_data = read_compose_file(target['compose_file']) or {}
+    services = compose_data.get('services') or {}
+    if target['service'] not in services:
+        raise LookupError(f"Service {target['service']} not found in {target['compose_file']}")
+    return environment_list(services[target['service']].get('environment'))
+
+def read_current_environment(target):
+    """Read a target's service environment as {key: value}; raises if it cannot be read"""
+    current_settings = {}
+    
+    # Parse environment variables
+    for env_var in read_environment_list(target):
+        if '=' in env_var:
+            key, value = env_var.split('=', 1)
+            current_settings[key] = value
+    return current_settings
+
+def patch_environment(env_vars, updates):
+    """Replace or append the updated keys, leaving every other entry as it was.
+
+    An empty value removes the key, since empty settings are never written.
+    """
+    patched = []
+    remaining = dict(updates)
+    for env_var in env_vars:
+        key = env_var.split('=', 1)[0]
+        if key not in remaining:
+            patched.append(env_var)
+            continue
+        value = remaining.pop(key)
+        if value.strip():
+            patched.append(f"{key}={value}")
+    patched.extend(f"{key}={value}" for key, value in remaining.items() if value.strip())
+    return patched
+
+def load_current_settings(target=None):
+    """Load current settings from docker-compose.yml, falling back to the defaults"""
+    target = target or get_target()
+    # Work on a copy so one target's values never leak into another's
+    settings = copy.deepcopy(DEFAULT_SETTINGS)
     try:
-        with open(COMPOSE_FILE, 'r') as f:
-            compose_data = yaml.safe_load(f)
+        current_settings = read_current_environment(target)
         
-        if 'services' in compose_data and 'decluttarr' in compose_data['services']:
-            env_vars = compose_data['services']['decluttarr'].get('environment', [])
-            current_settings = {}
-            
-            # Parse environment variables
-            for env_var in env_vars:
-                if '=' in env_var:
-                    key, value = env_var.split('=', 1)
-                    current_settings[key] = value
-            
-            # Update default settings with current values
-            for category in DEFAULT_SETTINGS:
-                for key in DEFAULT_SETTINGS[category]:
-                    if key in current_settings:
-                        DEFAULT_SETTINGS[category][key]['value'] = current_settings[key]
+        # Update default settings with current values
+        for category in settings:
+            for key in settings[category]:
+                if key in current_settings:
+                    settings[category][key]['value'] = current_settings[key]
         
-        return DEFAULT_SETTINGS
+        return settings
     except Exception as e:
         print(f"Error loading settings: {e}")
-        return DEFAULT_SETTINGS
+        return settings
 
-def save_settings_to_compose(settings_data):
+def save_settings_to_compose(settings_data, target=None):
     """Save settings to docker-compose.yml"""
+    target = target or get_target()
     try:
-        with open(COMPOSE_FILE, 'r') as f:
-            compose_data = yaml.safe_load(f)
-        
         # Build environment variables list
         env_vars = [
             'TZ=America/Detroit',
@@ -611,28 +816,537 @@ def save_settings_to_compose(settings_data):
                         env_vars.append(f"{key}={value}")
         
         # Update compose file
-        compose_data['services']['decluttarr']['environment'] = env_vars
-        
-        with open(COMPOSE_FILE, 'w') as f:
-            yaml.dump(compose_data, f, default_flow_style=False, sort_keys=False)
+        write_compose_environment(target, env_vars)
         
         return True
     except Exception as e:
         print(f"Error saving settings: {e}")
         return False
 
+def write_compose_environment(target, env_vars):
+    """Replace a target's environment in its compose file and record the snapshot"""
+    import yaml
+    compose_data = read_compose_file(target['compose_file'])
+    
+    service = compose_data['services'][target['service']]
+    previous = environment_list(service.get('environment'))
+    service['environment'] = env_vars
+    
+    with open(target['compose_file'], 'w') as f:
+        yaml.dump(compose_data, f, default_flow_style=False, sort_keys=False)
+    with compose_cache_lock:
+        compose_cache.pop(target['compose_file'], None)
+    
+    # History is best-effort; a failure here must not undo a successful save
+    try:
+        record_snapshot(target, env_vars, previous)
+    except Exception as e:
+        print(f"Error recording settings history: {e}")
+
+# Guards index.json against concurrent record/rebuild
+history_lock = threading.RLock()
+
+def history_dir(target):
+    if not target['compose_file']:
+        raise ValueError(f"Target {target['name']} has no compose_file, so it has no settings history")
+    return os.path.join(os.path.dirname(target['compose_file']), '.decluttarr-history', target['service'])
+
+def write_file_atomic(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def snapshot_hash(env_vars):
+    return hashlib.sha256(json.dumps(env_vars, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+def load_history_index(target):
+    """Load the version index, rebuilding it from the stored objects if it is corrupt"""
+    index_path = os.path.join(history_dir(target), 'index.json')
+    with history_lock:
+        try:
+            with open(index_path, 'r') as f:
+                index = json.load(f)
+            if not isinstance(index, list) or not all(
+                    isinstance(entry, dict) and isinstance(entry.get('hash'), str)
+                    and isinstance(entry.get('saved_at'), str) for entry in index):
+                raise ValueError('unexpected index format')
+            return index
+        except FileNotFoundError:
+            return []
+        except ValueError as e:
+            print(f"Settings history index {index_path} is corrupt ({e}); rebuilding it from stored versions")
+            os.replace(index_path, f"{index_path}.corrupt")
+            return rebuild_history_index(target)
+
+def rebuild_history_index(target):
+    """Recreate index.json from the objects on disk, ordered by when they were written"""
+    objects_dir = os.path.join(history_dir(target), 'objects')
+    objects = []
+    if os.path.isdir(objects_dir):
+        objects = [(os.path.getmtime(os.path.join(objects_dir, filename)), filename[:-5])
+                   for filename in os.listdir(objects_dir) if filename.endswith('.json')]
+    index = [{'hash': digest, 'saved_at': datetime.fromtimestamp(mtime).isoformat(timespec='seconds')}
+             for mtime, digest in sorted(objects)]
+    write_file_atomic(os.path.join(history_dir(target), 'index.json'), json.dumps(index, indent=1))
+    return index
+
+def store_snapshot_object(target, env_vars):
+    """Store an environment under its content hash; identical environments share one object"""
+    digest = snapshot_hash(env_vars)
+    path = os.path.join(history_dir(target), 'objects', f"{digest}.json")
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_file_atomic(path, json.dumps(env_vars, separators=(',', ':')))
+    return digest
+
+def prune_history(index):
+    """Apply the count and age limits to the index"""
+    if HISTORY_MAX_AGE_DAYS > 0:
+        cutoff = (datetime.now() - timedelta(days=HISTORY_MAX_AGE_DAYS)).isoformat(timespec='seconds')
+        # Always keep the newest version, however old
+        index = [entry for entry in index[:-1] if entry['saved_at'] >= cutoff] + index[-1:]
+    return index[-HISTORY_MAX_VERSIONS:]
+
+def collect_history_garbage(target, index):
+    """Delete objects the (already written) index no longer references"""
+    referenced = {entry['hash'] for entry in index}
+    objects_dir = os.path.join(history_dir(target), 'objects')
+    for filename in os.listdir(objects_dir):
+        if filename.endswith('.json') and filename[:-5] not in referenced:
+            os.remove(os.path.join(objects_dir, filename))
+
+def record_snapshot(target, env_vars, previous=None):
+    """Append a version to the target's history, skipping saves that change nothing"""
+    with history_lock:
+        index = load_history_index(target)
+        saved_at = datetime.now().isoformat(timespec='seconds')
+        if not index and previous:
+            # Seed an empty history with the environment being replaced so it can be restored
+            index.append({'hash': store_snapshot_object(target, previous), 'saved_at': saved_at})
+        
+        digest = store_snapshot_object(target, env_vars)
+        if index and index[-1]['hash'] == digest:
+            return digest
+        index.append({'hash': digest, 'saved_at': saved_at})
+        index = prune_history(index)
+        # Commit the new index before deleting anything, so it never points at removed objects
+        write_file_atomic(os.path.join(history_dir(target), 'index.json'), json.dumps(index, indent=1))
+        collect_history_garbage(target, index)
+        return digest
+
+def resolve_snapshot(target, ref):
+    """Find a version by full hash or unique prefix; returns None if there is no single match"""
+    matches = {entry['hash'] for entry in load_history_index(target) if entry['hash'].startswith(ref)}
+    if len(ref) < 6 or len(matches) != 1:
+        return None
+    digest = matches.pop()
+    return digest if os.path.exists(os.path.join(history_dir(target), 'objects', f"{digest}.json")) else None
+
+def load_snapshot(target, digest):
+    with open(os.path.join(history_dir(target), 'objects', f"{digest}.json"), 'r') as f:
+        return json.load(f)
+
+def diff_environments(old_vars, new_vars):
+    old = dict(var.split('=', 1) for var in old_vars if '=' in var)
+    new = dict(var.split('=', 1) for var in new_vars if '=' in var)
+    return {
+        'added': {key: new[key] for key in new.keys() - old.keys()},
+        'removed': {key: old[key] for key in old.keys() - new.keys()},
+        'changed': {key: {'from': old[key], 'to': new[key]}
+                    for key in old.keys() & new.keys() if old[key] != new[key]},
+    }
+
+def normalize_target(entry):
+    """Fill in defaults for one entry of the targets registry"""
+    if not entry.get('name'):
+        raise ValueError('Every target needs a name')
+    target = dict(DEFAULT_TARGET, **entry)
+    target['name'] = str(target['name'])
+    if target['compose_file'] and not target['working_dir']:
+        target['working_dir'] = os.path.dirname(target['compose_file'])
+    target['timeout'] = int(target['timeout'])
+    return target
+
+def load_targets():
+    """Load the targets registry, falling back to the single local deployment"""
+    if not TARGETS_FILE:
+        return {'default': normalize_target({'name': 'default'})}
+    import yaml
+    with open(TARGETS_FILE, 'r') as f:
+        entries = yaml.safe_load(f) or []
+    if isinstance(entries, dict):
+        entries = entries.get('targets', [])
+    targets = {}
+    for entry in entries:
+        target = normalize_target(entry)
+        if target['name'] in targets:
+            raise ValueError(f"Duplicate target name: {target['name']}")
+        targets[target['name']] = target
+    if not targets:
+        raise ValueError(f'No targets defined in {TARGETS_FILE}')
+    return targets
+
+TARGETS = load_targets()
+
+def get_target(name=None):
+    """Look up a target by name; None selects the first (default) target"""
+    if name is None:
+        return next(iter(TARGETS.values()))
+    if name not in TARGETS:
+        raise KeyError(name)
+    return TARGETS[name]
+
+def docker_env(target):
+    env = os.environ.copy()
+    if target['docker_host']:
+        env['DOCKER_HOST'] = target['docker_host']
+    return env
+
+class Deadline:
+    """One time budget shared by every docker command in an operation"""
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires = time.monotonic() + seconds
+
+    def remaining(self):
+        remaining = self.expires - time.monotonic()
+        if remaining <= 0:
+            raise subprocess.TimeoutExpired('docker', self.seconds)
+        return remaining
+
+def docker_command(target, args, deadline=None, check=False):
+    """Run a docker CLI command against a target's Docker endpoint within the deadline"""
+    deadline = deadline or Deadline(target['timeout'])
+    try:
+        return subprocess.run(['docker'] + args, capture_output=True, text=True,
+                              timeout=deadline.remaining(), check=check,
+                              env=docker_env(target), cwd=target['working_dir'] or None)
+    except subprocess.TimeoutExpired as e:
+        # Report the operation's budget, not whatever was left of it for this command
+        raise subprocess.TimeoutExpired(e.cmd, deadline.seconds) from None
+
+def compose_command(target, args, deadline):
+    if not target['compose_file']:
+        raise ValueError(f"Target {target['name']} has no compose_file")
+    return docker_command(target, ['compose', '-f', target['compose_file']] + args,
+                          deadline=deadline, check=True)
+
+def status_deadline(target):
+    return Deadline(min(target['timeout'], STATUS_TIMEOUT))
+
+def container_status(target, deadline=None):
+    result = docker_command(target, ['ps', '--filter', f"name=^/?{target['container']}$", '--format', '{{.Status}}'],
+                            deadline=deadline or status_deadline(target))
+    return 'running' if 'Up' in result.stdout else 'stopped'
+
+def container_lifecycle(target, action, deadline=None):
+    """Start, stop, restart or recreate a target's container, all within one deadline"""
+    service = target['service']
+    deadline = deadline or Deadline(target['timeout'])
+    if not target['compose_file']:
+        # Plain Docker endpoints have no compose file to recreate from
+        if action not in ('start', 'stop', 'restart'):
+            raise ValueError(f"Target {target['name']} has no compose_file; cannot {action}")
+        docker_command(target, [action, target['container']], deadline=deadline, check=True)
+        return
+    if action == 'start':
+        # Use compose up to ensure container is created with latest environment
+        compose_command(target, ['up', '-d', service], deadline)
+    elif action == 'stop':
+        compose_command(target, ['stop', service], deadline)
+    elif action == 'restart':
+        # Use compose down/up to force recreation with new environment variables
+        compose_command(target, ['stop', service], deadline)
+        compose_command(target, ['up', '-d', service], deadline)
+    elif action == 'recreate':
+        compose_command(target, ['stop', service], deadline)
+        compose_command(target, ['rm', '-f', service], deadline)
+        compose_command(target, ['up', '-d', service], deadline)
+    else:
+        raise ValueError(f'Invalid action: {action}')
+
+def run_across_targets(operation, targets, make_deadline=None):
+    """Run operation(target, deadline) for each target concurrently, collecting results by name.
+
+    Each target gets one Deadline (its timeout by default) for the whole operation.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    make_deadline = make_deadline or (lambda target: Deadline(target['timeout']))
+
+    def guarded(target):
+        try:
+            return operation(target, make_deadline(target))
+        except subprocess.TimeoutExpired as e:
+            return {'success': False, 'error': f"Timed out after {e.timeout}s"}
+        except subprocess.CalledProcessError as e:
+            return {'success': False, 'error': f'Docker error: {(e.stderr or str(e)).strip()}'}
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+
+    with ThreadPoolExecutor(max_workers=max(len(targets), 1)) as executor:
+        results = executor.map(guarded, targets)
+        return {target['name']: result for target, result in zip(targets, results)}
+
+def selected_targets():
+    """Targets named in ?targets=a,b, or all of them"""
+    names = [name for name in request.args.get('targets', '').split(',') if name]
+    return [get_target(name) for name in names] if names else list(TARGETS.values())
+
+class StackSampler:
+    """Samples the call stack of one thread at a fixed interval"""
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            if stack:
+                self.samples[tuple(reversed(stack))] += 1
+
+profile_store = deque(maxlen=PROFILE_MAX_STORED)
+profile_store_lock = threading.Lock()
+profile_ids = itertools.count(1)
+profile_request_counter = itertools.count(1)
+
+def profiling_authorized():
+    """Check the admin header or query flag against PROFILE_TOKEN"""
+    if not PROFILE_TOKEN:
+        return False
+    token = request.headers.get('X-Profile-Token') or request.args.get('profile') or ''
+    return hmac.compare_digest(token.encode('utf-8'), PROFILE_TOKEN.encode('utf-8'))
+
+def start_request_profile():
+    if request.path.startswith('/debug/profiles'):
+        return
+    sampled = PROFILE_SAMPLE_EVERY > 0 and next(profile_request_counter) % PROFILE_SAMPLE_EVERY == 0
+    if not (sampled or profiling_authorized()):
+        return
+    sampler = StackSampler(threading.get_ident(), PROFILE_INTERVAL_MS / 1000.0)
+    g.profile = {'sampler': sampler, 'started': time.time(), 'perf_start': time.perf_counter()}
+    sampler.start()
+
+def record_profile_status(response):
+    if 'profile' in g:
+        g.profile['status'] = response.status_code
+    return response
+
+def finish_request_profile(exc):
+    profile = g.pop('profile', None)
+    if profile is None:
+        return
+    profile['sampler'].stop()
+    if not profile['sampler'].samples:
+        # Finished inside one sampling interval: nothing was captured, so there is nothing to show
+        return
+    entry = {
+        'id': next(profile_ids),
+        'method': request.method,
+        'path': request.path,
+        'status': profile.get('status', 500),
+        'started': datetime.fromtimestamp(profile['started']).isoformat(timespec='seconds'),
+        'duration_ms': round((time.perf_counter() - profile['perf_start']) * 1000, 2),
+        'interval_ms': PROFILE_INTERVAL_MS,
+        'samples': profile['sampler'].samples,
+    }
+    with profile_store_lock:
+        profile_store.append(entry)
+
+def profile_to_collapsed(entry):
+    """Render a profile in collapsed-stack format (flamegraph.pl, speedscope)"""
+    lines = []
+    for stack, count in entry['samples'].items():
+        frames = ';'.join(f"{name} ({os.path.basename(filename)}:{line})" for name, filename, line in stack)
+        lines.append(f"{frames} {count}")
+    return '\n'.join(lines) + '\n'
+
+def profile_to_speedscope(entry):
+    """Render a profile in speedscope's sampled JSON format"""
+    frames = []
+    frame_index = {}
+    samples = []
+    weights = []
+    for stack, count in entry['samples'].items():
+        indexes = []
+        for name, filename, line in stack:
+            key = (name, filename, line)
+            if key not in frame_index:
+                frame_index[key] = len(frames)
+                frames.append({'name': name, 'file': filename, 'line': line})
+            indexes.append(frame_index[key])
+        samples.append(indexes)
+        weights.append(count * entry['interval_ms'])
+    name = f"{entry['method']} {entry['path']}"
+    return {
+        '$schema': 'https://www.speedscope.app/file-format-schema.json',
+        'name': name,
+        'exporter': 'decluttarr-manager',
+        'activeProfileIndex': 0,
+        'shared': {'frames': frames},
+        'profiles': [{
+            'type': 'sampled',
+            'name': name,
+            'unit': 'milliseconds',
+            'startValue': 0,
+            'endValue': sum(weights),
+            'samples': samples,
+            'weights': weights,
+        }],
+    }
+
+def list_profiles():
+    if not profiling_authorized():
+        return jsonify({'error': 'Profiling token required'}), 403
+    with profile_store_lock:
+        entries = list(profile_store)
+    profiles = []
+    for entry in reversed(entries):
+        summary = {key: value for key, value in entry.items() if key != 'samples'}
+        summary['sample_count'] = sum(entry['samples'].values())
+        profiles.append(summary)
+    return jsonify({'profiles': profiles})
+
+def download_profile(profile_id):
+    if not profiling_authorized():
+        return jsonify({'error': 'Profiling token required'}), 403
+    with profile_store_lock:
+        entry = next((entry for entry in profile_store if entry['id'] == profile_id), None)
+    if entry is None:
+        return jsonify({'error': 'Profile not found'}), 404
+
+    profile_format = request.args.get('format', 'speedscope')
+    if profile_format == 'speedscope':
+        body = json.dumps(profile_to_speedscope(entry))
+        mimetype, extension = 'application/json', 'speedscope.json'
+    elif profile_format == 'collapsed':
+        body = profile_to_collapsed(entry)
+        mimetype, extension = 'text/plain', 'collapsed.txt'
+    else:
+        return jsonify({'error': 'format must be speedscope or collapsed'}), 400
+    return Response(body, mimetype=mimetype, headers={
+        'Content-Disposition': f'attachment; filename=profile-{profile_id}.{extension}'
+    })
+
+# Hooks are only registered when profiling is configured, so requests pay nothing otherwise.
+# Profiles expose paths and source locations, so nothing is collected or served without a token.
+if PROFILE_TOKEN:
+    app.before_request(start_request_profile)
+    app.after_request(record_profile_status)
+    app.teardown_request(finish_request_profile)
+    app.add_url_rule('/debug/profiles', 'list_profiles', list_profiles)
+    app.add_url_rule('/debug/profiles/<int:profile_id>', 'download_profile', download_profile)
+
+def request_target():
+    """Target named in ?target=, or the default one"""
+    name = request.args.get('target')
+    try:
+        return get_target(name)
+    except KeyError:
+        response = jsonify({'error': f'Unknown target: {name}'})
+        response.status_code = 404
+        abort(response)
+
+home_template = None
+
+def get_home_template():
+    """Compile HTML_TEMPLATE once instead of on every page load"""
+    global home_template
+    if home_template is None:
+        home_template = app.jinja_env.from_string(HTML_TEMPLATE)
+    return home_template
+
+def warm_up_steps():
+    """Warm-up steps as (name, step, required); only required failures make /readyz fail"""
+    steps = [
+        ('import yaml', lambda: importlib.import_module('yaml'), True),
+        ('import concurrent.futures', lambda: importlib.import_module('concurrent.futures'), True),
+        ('compile template', get_home_template, True),
+        # Only the connection test needs requests
+        ('import requests', lambda: importlib.import_module('requests'), False),
+    ]
+    for target in TARGETS.values():
+        if target['compose_file']:
+            # One target's compose file being unreadable should not take the whole manager out
+            steps.append((f"parse {target['name']} compose file",
+                          lambda target=target: read_current_environment(target), False))
+    return steps
+
+def run_warm_up_steps(names=None):
+    """Run the named warm-up steps (all by default), updating errors and warnings by step name"""
+    with warmup_lock:
+        for name, step, required in warm_up_steps():
+            if names is not None and name not in names:
+                continue
+            failures = warmup_stats['errors'] if required else warmup_stats['warnings']
+            try:
+                step()
+            except Exception as e:
+                print(f"Error during warm-up ({name}): {e}")
+                failures[name] = str(e)
+            else:
+                failures.pop(name, None)
+
+def warm_up():
+    """Pay one-off startup costs in the background so the first request does not.
+
+    Each step runs on its own so one failure does not skip the rest. Failed steps
+    are retried by /readyz, so a briefly missing file does not need a restart.
+    """
+    started = time.monotonic()
+    warmup_stats.update(errors={}, warnings={})
+    run_warm_up_steps()
+    warmup_stats['warmup_ms'] = round((time.monotonic() - started) * 1000, 1)
+    warmup_stats['boot_to_ready_ms'] = round((time.monotonic() - BOOT_STARTED) * 1000, 1)
+    warmup_done.set()
+
+@app.route('/healthz')
+def healthz():
+    return jsonify({'status': 'ok'})
+
+@app.route('/readyz')
+def readyz():
+    if not warmup_done.is_set():
+        return jsonify({'ready': False}), 503
+    failed = set(warmup_stats['errors']) | set(warmup_stats['warnings'])
+    if failed:
+        run_warm_up_steps(failed)
+    stats = dict(warmup_stats, errors=dict(warmup_stats['errors']), warnings=dict(warmup_stats['warnings']))
+    if stats['errors']:
+        return jsonify(dict(stats, ready=False)), 503
+    return jsonify(dict(stats, ready=True))
+
 @app.route('/')
 def home():
-    config = load_current_settings()
+    target = request_target()
+    config = load_current_settings(target)
     message = request.args.get('message')
     message_type = request.args.get('type', 'success')
     
-    return render_template_string(HTML_TEMPLATE, 
+    return render_template(get_home_template(), 
                                 config=config, 
+                                target=target,
+                                targets=list(TARGETS),
                                 message={'text': message, 'type': message_type} if message else None)
 
 @app.route('/save-settings', methods=['POST'])
 def save_settings():
+    target = request_target()
     try:
         settings_data = request.form.to_dict(flat=False)
         
@@ -651,50 +1365,216 @@ def save_settings():
                 flat_settings[key] = value
         
         # Handle unchecked checkboxes (they don't appear in form data)
-        checkbox_fields = [
-            'REMOVE_FAILED', 'REMOVE_FAILED_IMPORTS', 'REMOVE_METADATA_MISSING',
-            'REMOVE_MISSING_FILES', 'REMOVE_ORPHANS', 'REMOVE_SLOW', 
-            'REMOVE_STALLED', 'REMOVE_UNMONITORED', 'IGNORE_PRIVATE_TRACKERS'
-        ]
-        for field in checkbox_fields:
-            if field not in flat_settings:
-                flat_settings[field] = 'False'
+        for key, spec in SETTINGS_SCHEMA.items():
+            if spec['type'] == 'boolean' and key not in flat_settings:
+                flat_settings[key] = 'False'
         
-        if save_settings_to_compose(flat_settings):
-            return redirect(url_for('home', message='Settings saved successfully! Use the Actions tab to restart and apply changes.', type='success'))
+        with settings_write_lock:
+            saved = save_settings_to_compose(flat_settings, target)
+        if saved:
+            return redirect(url_for('home', target=target['name'], message='Settings saved successfully! Use the Actions tab to restart and apply changes.', type='success'))
         else:
-            return redirect(url_for('home', message='Error saving settings. Please try again.', type='error'))
+            return redirect(url_for('home', target=target['name'], message='Error saving settings. Please try again.', type='error'))
+    except Exception as e:
+        return redirect(url_for('home', target=target['name'], message=f'Error: {str(e)}', type='error'))
+
+def setting_to_json(spec, value):
+    """Convert a stored environment string to its JSON type"""
+    if spec['type'] == 'boolean':
+        return value == 'True'
+    if spec['type'] == 'number':
+        try:
+            return int(value)
+        except ValueError:
+            return value
+    return value
+
+def coerce_setting(spec, value):
+    """Validate a JSON value against its schema entry and return the environment string"""
+    if value is None:
+        # Merge-patch null resets the setting to its default
+        return spec['value']
+    if spec['type'] == 'boolean':
+        if isinstance(value, str) and value.lower() in ('true', 'false'):
+            value = value.lower() == 'true'
+        if not isinstance(value, bool):
+            raise ValueError('must be a boolean')
+        return 'True' if value else 'False'
+    if spec['type'] == 'number':
+        if isinstance(value, str) and value.strip().lstrip('-').isdigit():
+            value = int(value)
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError('must be an integer')
+        if 'min' in spec and value < spec['min']:
+            raise ValueError(f"must be at least {spec['min']}")
+        if 'max' in spec and value > spec['max']:
+            raise ValueError(f"must be at most {spec['max']}")
+        return str(value)
+    if not isinstance(value, str):
+        raise ValueError('must be a string')
+    # Empty values are not written, so the setting would silently fall back to its default
+    if not value.strip() and spec['value']:
+        raise ValueError('cannot be empty; use null to reset it to the default')
+    if spec['type'] == 'select' and value not in spec['options']:
+        raise ValueError(f"must be one of {', '.join(spec['options'])}")
+    return value
+
+def current_setting_values(target):
+    """Flat {key: environment string} view of a target's current settings.
+
+    Unlike load_current_settings(), errors are raised rather than answered with
+    the defaults, so an ETag is only ever computed from real data.
+    """
+    current_settings = read_current_environment(target)
+    return {key: current_settings.get(key, spec['value']) for key, spec in SETTINGS_SCHEMA.items()}
+
+def settings_read_error(target, error):
+    if not target['compose_file']:
+        return jsonify({'error': f"Target {target['name']} has no compose file to hold settings"}), 409
+    print(f"Error loading settings: {error}")
+    return jsonify({'error': f'Error reading settings: {str(error)}'}), 500
+
+def settings_etag(values):
+    return hashlib.sha256(json.dumps(values, sort_keys=True).encode('utf-8')).hexdigest()[:32]
+
+def settings_response(values, status_code=200):
+    response = jsonify({'settings': {key: setting_to_json(SETTINGS_SCHEMA[key], value)
+                                     for key, value in values.items()}})
+    response.status_code = status_code
+    response.set_etag(settings_etag(values))
+    return response
+
+@app.route('/api/settings/schema')
+def get_settings_schema():
+    return jsonify(PUBLIC_SETTINGS_SCHEMA)
+
+@app.route('/api/settings')
+def get_settings():
+    target = request_target()
+    try:
+        return settings_response(current_setting_values(target))
+    except Exception as e:
+        return settings_read_error(target, e)
+
+@app.route('/api/settings', methods=['PATCH'])
+def patch_settings():
+    """Apply a partial update; all keys are validated and written together"""
+    target = request_target()
+    changes = request.get_json(force=True, silent=True)
+    if not isinstance(changes, dict):
+        return jsonify({'error': 'Body must be a JSON object of setting names to values'}), 400
+
+    updates = {}
+    errors = {}
+    for key, value in changes.items():
+        if key not in SETTINGS_SCHEMA:
+            errors[key] = 'unknown setting'
+            continue
+        try:
+            updates[key] = coerce_setting(SETTINGS_SCHEMA[key], value)
+        except ValueError as e:
+            errors[key] = str(e)
+    if errors:
+        return jsonify({'errors': errors}), 422
+
+    with settings_write_lock:
+        try:
+            values = current_setting_values(target)
+        except Exception as e:
+            return settings_read_error(target, e)
+        if request.if_match and not request.if_match.contains(settings_etag(values)):
+            return settings_response(values, 412)
+        try:
+            # Only the requested keys change; TZ, PUID and anything unmanaged stay as they are
+            write_compose_environment(target, patch_environment(read_environment_list(target), updates))
+        except Exception as e:
+            print(f"Error saving settings: {e}")
+            return jsonify({'error': f'Error saving settings: {str(e)}'}), 500
+        try:
+            saved = current_setting_values(target)
+        except Exception as e:
+            return settings_read_error(target, e)
+    # Never report success for a value that did not make it into the compose file
+    mismatched = sorted(key for key, value in updates.items() if saved[key] != value)
+    if mismatched:
+        return jsonify({'error': 'Settings were not stored as requested', 'keys': mismatched}), 500
+    return settings_response(saved)
+
+def history_target():
+    """Target from ?target=, which must have a compose file to keep history for"""
+    target = request_target()
+    if not target['compose_file']:
+        response = jsonify({'error': f"Target {target['name']} has no compose file, so it has no settings history"})
+        response.status_code = 400
+        abort(response)
+    return target
+
+@app.route('/api/settings/history')
+def get_settings_history():
+    target = history_target()
+    index = load_history_index(target)
+    versions = [dict(entry, current=position == len(index) - 1)
+                for position, entry in enumerate(index)]
+    return jsonify({'versions': versions[::-1]})
+
+@app.route('/api/settings/history/<ref>')
+def get_settings_version(ref):
+    target = history_target()
+    digest = resolve_snapshot(target, ref)
+    if digest is None:
+        return jsonify({'error': f'Unknown version: {ref}'}), 404
+    return jsonify({'hash': digest, 'environment': load_snapshot(target, digest)})
+
+@app.route('/api/settings/history/<old_ref>/diff/<new_ref>')
+def diff_settings_versions(old_ref, new_ref):
+    target = history_target()
+    environments = []
+    for ref in (old_ref, new_ref):
+        digest = resolve_snapshot(target, ref)
+        if digest is None:
+            return jsonify({'error': f'Unknown version: {ref}'}), 404
+        environments.append(load_snapshot(target, digest))
+    return jsonify(diff_environments(*environments))
+
+@app.route('/api/settings/history/<ref>/rollback', methods=['POST'])
+def rollback_settings(ref):
+    """Write a previous version back to the compose file and recreate the container"""
+    target = history_target()
+    digest = resolve_snapshot(target, ref)
+    if digest is None:
+        return jsonify({'error': f'Unknown version: {ref}'}), 404
+    try:
+        with settings_write_lock:
+            write_compose_environment(target, load_snapshot(target, digest))
+        container_lifecycle(target, 'recreate')
+        return jsonify({'message': f'Rolled back to {digest[:12]} and recreated the container', 'hash': digest})
+    except subprocess.TimeoutExpired as e:
+        return jsonify({'message': f'Settings restored, but docker compose timed out after {e.timeout}s', 'hash': digest}), 504
+    except subprocess.CalledProcessError as e:
+        return jsonify({'message': f'Settings restored, but docker compose failed: {str(e)}', 'hash': digest}), 500
     except Exception as e:
-        return redirect(url_for('home', message=f'Error: {str(e)}', type='error'))
+        return jsonify({'message': f'Error: {str(e)}'}), 500
 
 @app.route('/api/container/restart-with-settings', methods=['POST'])
 def restart_with_settings():
     """Restart container after settings change - forces recreation to load new environment variables"""
+    target = request_target()
     try:
-        # Stop the container
-        subprocess.run(['docker', 'compose', '-f', '/docker/decluttarr/docker-compose.yml', 'stop', 'decluttarr'], 
-                     timeout=30, check=True, cwd='/docker/decluttarr')
-        
-        # Remove the container to force recreation
-        subprocess.run(['docker', 'compose', '-f', '/docker/decluttarr/docker-compose.yml', 'rm', '-f', 'decluttarr'], 
-                     timeout=30, check=True, cwd='/docker/decluttarr')
-        
-        # Start with new settings
-        subprocess.run(['docker', 'compose', '-f', '/docker/decluttarr/docker-compose.yml', 'up', '-d', 'decluttarr'], 
-                     timeout=60, check=True, cwd='/docker/decluttarr')
-        
+        container_lifecycle(target, 'recreate')
         return jsonify({'message': 'Container recreated successfully with new settings!'})
+    except subprocess.TimeoutExpired as e:
+        return jsonify({'message': f'Timed out after {e.timeout}s'}), 504
     except subprocess.CalledProcessError as e:
-        return jsonify({'message': f'Docker compose error: {str(e)}'}, 500)
+        return jsonify({'message': f'Docker compose error: {str(e)}'}), 500
     except Exception as e:
-        return jsonify({'message': f'Error: {str(e)}'}, 500)
+        return jsonify({'message': f'Error: {str(e)}'}), 500
 
 @app.route('/api/logs')
 def get_logs():
+    target = request_target()
     try:
         # Get logs with timestamps from last 24 hours
-        result = subprocess.run(['docker', 'logs', '--timestamps', '--since', '24h', 'decluttarr'], 
-                              capture_output=True, text=True, timeout=30)
+        result = docker_command(target, ['logs', '--timestamps', '--since', '24h', target['container']])
         
         logs = []
         # Docker logs can come from both stdout and stderr
@@ -705,54 +1585,301 @@ def get_logs():
         
         logs = [log.strip() for log in logs if log.strip()]
         
-        # Check status
-        status_result = subprocess.run(['docker', 'ps', '--filter', 'name=decluttarr', '--format', '{{.Status}}'], 
-                                     capture_output=True, text=True, timeout=5)
-        status = 'running' if 'Up' in status_result.stdout else 'stopped'
-        
-        return jsonify({'logs': logs, 'status': status})
+        return jsonify({'logs': logs, 'status': container_status(target)})
     except Exception as e:
         return jsonify({'logs': [f'Error: {str(e)}'], 'status': 'unknown'})
 
+LOG_TIME_ARG = re.compile(r'^[0-9A-Za-z][0-9A-Za-z:.+\-]*$')
+LOG_LINE = re.compile(r'^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(\.\d+)?(Z|[+\-]\d{2}:\d{2})\s?(.*)$')
+
+def parse_log_time(line):
+    """Split a `docker logs --timestamps` line into (aware datetime or None, message)"""
+    match = LOG_LINE.match(line)
+    if not match:
+        return None, line
+    seconds, fraction, zone, message = match.groups()
+    # Docker emits nanoseconds; datetime only keeps microseconds
+    fraction = (fraction or '.0')[:7]
+    zone = '+00:00' if zone == 'Z' else zone
+    try:
+        return datetime.fromisoformat(f"{seconds}{fraction}{zone}"), message
+    except ValueError:
+        return None, message
+
+def parse_log_line(line, stream):
+    """Split a `docker logs --timestamps` line into a record"""
+    timestamp, message = parse_log_time(line)
+    return {'timestamp': timestamp.isoformat() if timestamp else None, 'stream': stream, 'message': message}
+
+def container_logs_args(target, since='', until=''):
+    args = ['docker', 'logs', '--timestamps']
+    if since:
+        args += ['--since', since]
+    if until:
+        args += ['--until', until]
+    return args + [target['container']]
+
+class ContainerLogs:
+    """`docker logs` for one target, read without buffering the whole output.
+
+    docker writes stdout and stderr in time order, so both readers feed one
+    bounded queue and lines come out in the order they arrive. The process is
+    started (and obvious docker failures raised) in the constructor, before any
+    response is sent.
+    """
+    # Lines looked at up front to tell a docker CLI error from container output
+    EARLY_FAILURE_LINES = 20
+
+    def __init__(self, target, since='', until='', deadline=None):
+        self.deadline = deadline
+        self.process = subprocess.Popen(container_logs_args(target, since, until), stdout=subprocess.PIPE,
+                                        stderr=subprocess.PIPE, text=True, errors='replace', bufsize=1,
+                                        env=docker_env(target))
+        self.lines = queue.Queue(maxsize=1000)
+        self.readers = [threading.Thread(target=self._pump, args=(getattr(self.process, stream), stream), daemon=True)
+                        for stream in ('stdout', 'stderr')]
+        for reader in self.readers:
+            reader.start()
+        self.closed = False
+        self.open_streams = 2
+        self.pending = deque()
+        try:
+            self._check_early_failure()
+        except BaseException:
+            self.close()
+            raise
+
+    def _check_early_failure(self):
+        """CLI errors (no such container, unreachable daemon) are a short stderr message and a non-zero exit"""
+        while len(self.pending) < self.EARLY_FAILURE_LINES:
+            stream, line = self._read()
+            if line is None:
+                self.open_streams -= 1
+                if not self.open_streams:
+                    break
+                continue
+            self.pending.append((stream, line))
+            if stream == 'stdout':
+                return
+        if self.open_streams:
+            return
+        try:
+            returncode = self.process.wait(timeout=self._remaining())
+        except subprocess.TimeoutExpired:
+            raise subprocess.TimeoutExpired('docker logs', self.deadline.seconds)
+        if returncode != 0:
+            message = '\n'.join(line for stream, line in self.pending if stream == 'stderr')
+            raise subprocess.CalledProcessError(returncode, 'docker logs', stderr=message)
+
+    def _pump(self, pipe, stream):
+        for line in pipe:
+            if line.strip():
+                self.lines.put((stream, line.rstrip('\n')))
+        self.lines.put((stream, None))
+
+    def _remaining(self):
+        return self.deadline.remaining() if self.deadline else None
+
+    def _read(self):
+        try:
+            return self.lines.get(timeout=self._remaining())
+        except queue.Empty:
+            raise subprocess.TimeoutExpired('docker logs', self.deadline.seconds)
+
+    def __iter__(self):
+        """Yield (stream, line) pairs"""
+        try:
+            while self.pending:
+                yield self.pending.popleft()
+            while self.open_streams:
+                stream, line = self._read()
+                if line is None:
+                    self.open_streams -= 1
+                else:
+                    yield stream, line
+        finally:
+            self.close()
+
+    def close(self):
+        """Stop docker (e.g. when the client disconnects mid-export) and unblock the readers"""
+        if self.closed:
+            return
+        self.closed = True
+        self.process.kill()
+        # Readers may be blocked on a full queue; keep emptying it until they finish
+        while any(reader.is_alive() for reader in self.readers):
+            try:
+                while True:
+                    self.lines.get_nowait()
+            except queue.Empty:
+                pass
+            for reader in self.readers:
+                reader.join(timeout=0.01)
+        self.process.wait()
+
+def gzip_chunks(chunks, flush_bytes=64 * 1024):
+    """Gzip an iterable of strings on the fly"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    pending = 0
+    for chunk in chunks:
+        data = chunk.encode('utf-8')
+        pending += len(data)
+        compressed = compressor.compress(data)
+        if pending >= flush_bytes:
+            compressed += compressor.flush(zlib.Z_SYNC_FLUSH)
+            pending = 0
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+@app.route('/api/logs/export')
+def export_logs():
+    """Stream decluttarr logs as gzipped NDJSON or text"""
+    target = request_target()
+    since = request.args.get('since', '24h')
+    until = request.args.get('until', '')
+    export_format = request.args.get('format', 'ndjson')
+
+    if export_format not in ('ndjson', 'text'):
+        return jsonify({'error': 'format must be ndjson or text'}), 400
+    for value in (since, until):
+        if value and not LOG_TIME_ARG.match(value):
+            return jsonify({'error': f'Invalid time value: {value}'}), 400
+
+    try:
+        logs = ContainerLogs(target, since, until)
+    except subprocess.CalledProcessError as e:
+        return jsonify({'error': f'Docker error: {(e.stderr or str(e)).strip()}'}), 500
+    except Exception as e:
+        return jsonify({'error': f'Error: {str(e)}'}), 500
+
+    def records():
+        for stream, line in logs:
+            record = parse_log_line(line, stream)
+            if export_format == 'ndjson':
+                yield json.dumps(record) + '\n'
+            else:
+                yield f"{record['timestamp'] or '-'} {stream} {record['message']}\n"
+
+    extension = 'ndjson' if export_format == 'ndjson' else 'log'
+    filename = f"{target['container']}-logs-{datetime.now().strftime('%Y%m%d-%H%M%S')}.{extension}.gz"
+    response = Response(gzip_chunks(records()), mimetype='application/gzip', headers={
+        'Content-Disposition': f'attachment; filename={filename}'
+    })
+    # Also covers clients that disconnect before the first chunk is generated
+    response.call_on_close(logs.close)
+    return response
+
 @app.route('/api/status')
 def get_status():
+    target = request_target()
     try:
-        result = subprocess.run(['docker', 'ps', '--filter', 'name=decluttarr', '--format', '{{.Status}}'], 
-                              capture_output=True, text=True, timeout=5)
-        status = 'running' if 'Up' in result.stdout else 'stopped'
-        return jsonify({'status': status})
+        return jsonify({'status': container_status(target)})
     except Exception as e:
         return jsonify({'status': 'unknown', 'error': str(e)})
 
+CONTAINER_ACTION_MESSAGES = {
+    'start': 'Container started successfully (with latest settings)',
+    'stop': 'Container stopped successfully',
+    'restart': 'Container restarted successfully (settings applied)',
+}
+
 @app.route('/api/container/<action>', methods=['POST'])
 def container_action(action):
+    target = request_target()
+    if action not in CONTAINER_ACTION_MESSAGES:
+        return jsonify({'message': 'Invalid action'}), 400
     try:
-        if action == 'start':
-            # Use compose up to ensure container is created with latest environment
-            subprocess.run(['docker', 'compose', '-f', '/docker/decluttarr/docker-compose.yml', 'up', '-d', 'decluttarr'], 
-                         timeout=60, check=True, cwd='/docker/decluttarr')
-            return jsonify({'message': 'Container started successfully (with latest settings)'})
-        elif action == 'stop':
-            subprocess.run(['docker', 'compose', '-f', '/docker/decluttarr/docker-compose.yml', 'stop', 'decluttarr'], 
-                         timeout=30, check=True, cwd='/docker/decluttarr')
-            return jsonify({'message': 'Container stopped successfully'})
-        elif action == 'restart':
-            # Use compose down/up to force recreation with new environment variables
-            subprocess.run(['docker', 'compose', '-f', '/docker/decluttarr/docker-compose.yml', 'stop', 'decluttarr'], 
-                         timeout=30, check=True, cwd='/docker/decluttarr')
-            subprocess.run(['docker', 'compose', '-f', '/docker/decluttarr/docker-compose.yml', 'up', '-d', 'decluttarr'], 
-                         timeout=60, check=True, cwd='/docker/decluttarr')
-            return jsonify({'message': 'Container restarted successfully (settings applied)'})
-        else:
-            return jsonify({'message': 'Invalid action'}, 400)
+        container_lifecycle(target, action)
+        return jsonify({'message': CONTAINER_ACTION_MESSAGES[action]})
+    except subprocess.TimeoutExpired as e:
+        return jsonify({'message': f'Timed out after {e.timeout}s'}), 504
     except subprocess.CalledProcessError as e:
-        return jsonify({'message': f'Docker compose error: {str(e)}'}, 500)
+        return jsonify({'message': f'Docker compose error: {str(e)}'}), 500
     except Exception as e:
-        return jsonify({'message': f'Error: {str(e)}'}, 500)
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@app.route('/api/targets')
+def list_targets():
+    return jsonify({'targets': [
+        {key: target[key] for key in ('name', 'compose_file', 'service', 'container', 'docker_host', 'timeout')}
+        for target in TARGETS.values()
+    ]})
+
+@app.route('/api/targets/status')
+def targets_status():
+    """Status board across all (or ?targets=) instances"""
+    try:
+        targets = selected_targets()
+    except KeyError as e:
+        return jsonify({'error': f'Unknown target: {e.args[0]}'}), 404
+
+    def status(target, deadline):
+        return {'success': True, 'status': container_status(target, deadline)}
+
+    results = run_across_targets(status, targets, status_deadline)
+    summary = Counter(result.get('status', 'unknown') for result in results.values())
+    return jsonify({'targets': results, 'summary': dict(summary)})
+
+@app.route('/api/targets/container/<action>', methods=['POST'])
+def targets_container_action(action):
+    """Run a lifecycle action on all (or ?targets=) instances concurrently"""
+    if action not in CONTAINER_ACTION_MESSAGES and action != 'recreate':
+        return jsonify({'message': 'Invalid action'}), 400
+    try:
+        targets = selected_targets()
+    except KeyError as e:
+        return jsonify({'error': f'Unknown target: {e.args[0]}'}), 404
+
+    def lifecycle(target, deadline):
+        container_lifecycle(target, action, deadline)
+        return {'success': True}
+
+    results = run_across_targets(lifecycle, targets)
+    status_code = 200 if all(result['success'] for result in results.values()) else 502
+    return jsonify({'targets': results}), status_code
+
+LOG_SEARCH_DEFAULT_LIMIT = 500
+LOG_SEARCH_MAX_LIMIT = 5000
+
+@app.route('/api/targets/logs/search')
+def targets_log_search():
+    """Search logs of all (or ?targets=) instances and merge matches by timestamp"""
+    query = request.args.get('q', '').lower()
+    since = request.args.get('since', '1h')
+    try:
+        limit = int(request.args.get('limit', LOG_SEARCH_DEFAULT_LIMIT))
+    except ValueError:
+        limit = 0
+    if limit < 1:
+        return jsonify({'error': 'limit must be a positive integer'}), 400
+    limit = min(limit, LOG_SEARCH_MAX_LIMIT)
+    if since and not LOG_TIME_ARG.match(since):
+        return jsonify({'error': f'Invalid time value: {since}'}), 400
+    try:
+        targets = selected_targets()
+    except KeyError as e:
+        return jsonify({'error': f'Unknown target: {e.args[0]}'}), 404
+
+    def search(target, deadline):
+        # Keep only the newest matches so memory is bounded by the limit
+        matches = deque(maxlen=limit)
+        for stream, line in ContainerLogs(target, since, deadline=deadline):
+            if query in line.lower():
+                record = parse_log_line(line, stream)
+                record['target'] = target['name']
+                matches.append(record)
+        return {'success': True, 'matches': list(matches)}
+
+    results = run_across_targets(search, targets)
+    merged = sorted((record for result in results.values() for record in result.get('matches', [])),
+                    key=lambda record: record['timestamp'] or '')[-limit:]
+    errors = {name: result['error'] for name, result in results.items() if not result['success']}
+    return jsonify({'matches': merged, 'errors': errors, 'limit': limit})
 
 @app.route('/api/test-connections')
 def test_connections():
-    config = load_current_settings()
+    config = load_current_settings(request_target())
     results = {}
     
     # Test each *arr service
@@ -782,5 +1909,7 @@ def test_connections():
     
     return jsonify(results)
 
+threading.Thread(target=warm_up, name='warm-up', daemon=True).start()
+
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=8081, debug=False)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=int(os.environ.get('MANAGER_PORT', '8081')), debug=False)
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""Shared fixtures: load decluttarr-manager.py as a module and stand in for the docker CLI."""
+import importlib.util
+import os
+
+import pytest
+
+MANAGER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'decluttarr-manager.py')
+
+# Settings read at import time; cleared so the host environment cannot leak into a test
+MANAGER_ENV = ('COMPOSE_FILE', 'DECLUTTARR_TARGETS', 'PROFILE_TOKEN', 'PROFILE_SAMPLE_EVERY',
+               'PROFILE_MAX_STORED', 'PROFILE_INTERVAL_MS', 'HISTORY_MAX_VERSIONS', 'HISTORY_MAX_AGE_DAYS')
+
+
+@pytest.fixture
+def load_manager(monkeypatch):
+    """Return a loader that imports a fresh copy of the manager with the given environment"""
+    for name in MANAGER_ENV:
+        monkeypatch.delenv(name, raising=False)
+
+    def load(**env):
+        for name, value in env.items():
+            monkeypatch.setenv(name, str(value))
+        spec = importlib.util.spec_from_file_location('decluttarr_manager', MANAGER)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        module.warmup_done.wait(10)
+        return module
+
+    return load
+
+
+@pytest.fixture
+def fake_docker(tmp_path, monkeypatch):
+    """Return an installer that puts a shell script on PATH as `docker`.
+
+    Every call is logged as DOCKER_HOST|args; the installer returns a function
+    that reads that log back as [host, args] pairs.
+    """
+    calls = tmp_path / 'docker-calls'
+    bin_dir = tmp_path / 'bin'
+
+    def install(script):
+        bin_dir.mkdir(exist_ok=True)
+        docker = bin_dir / 'docker'
+        docker.write_text(f'#!/bin/sh\necho "$DOCKER_HOST|$*" >> "{calls}"\n{script}')
+        docker.chmod(0o755)
+        monkeypatch.setenv('PATH', f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+        def recorded_calls():
+            return [line.split('|', 1) for line in calls.read_text().splitlines()] if calls.exists() else []
+
+        return recorded_calls
+
+    return install
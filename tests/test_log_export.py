@@ -0,0 +1,123 @@
+"""Streaming log export: constant-memory reads of docker logs, gzip framing and early docker errors."""
+import gzip
+import json
+import threading
+import time
+import zlib
+
+import pytest
+
+# $FAKE_LOGS picks what the fake `docker logs` prints
+FAKE_DOCKER = '''\
+[ "$1" = logs ] || exit 0
+case "$FAKE_LOGS" in
+  stdout-only) seq 1 20000 | sed 's/^/2024-05-01T12:00:00.123456789Z stdout line /';;
+  interleaved)
+    echo "2024-05-01T12:00:00Z first stdout line"
+    seq 1 1500 | sed 's/^/2024-05-01T12:00:01Z stderr line /' >&2
+    seq 1 5 | sed 's/^/2024-05-01T12:00:02Z later stdout line /';;
+  missing) echo "Error response from daemon: No such container: decluttarr" >&2; exit 1;;
+esac
+'''
+
+
+@pytest.fixture
+def manager(tmp_path, load_manager, fake_docker):
+    compose_file = tmp_path / 'docker-compose.yml'
+    compose_file.write_text('services:\n  decluttarr:\n    environment: []\n')
+    recorded_calls = fake_docker(FAKE_DOCKER)
+    module = load_manager(COMPOSE_FILE=compose_file)
+    module.recorded_calls = recorded_calls
+    return module
+
+
+def get_within(client, url, seconds=20):
+    """GET url on a thread so a deadlock fails the test instead of hanging it"""
+    result = {}
+    worker = threading.Thread(target=lambda: result.update(response=client.get(url)), daemon=True)
+    worker.start()
+    worker.join(seconds)
+    assert 'response' in result, f'{url} did not finish within {seconds}s'
+    return result['response']
+
+
+def ndjson_records(response):
+    return [json.loads(line) for line in gzip.decompress(response.data).decode('utf-8').splitlines()]
+
+
+def test_large_stdout_only_range_streams_as_gzip_ndjson(manager, monkeypatch):
+    monkeypatch.setenv('FAKE_LOGS', 'stdout-only')
+    response = get_within(manager.app.test_client(), '/api/logs/export?since=24h')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/gzip'
+    records = ndjson_records(response)
+    assert len(records) == 20000
+    assert records[0] == {'timestamp': '2024-05-01T12:00:00.123456+00:00', 'stream': 'stdout',
+                          'message': 'stdout line 1'}
+    assert records[-1]['message'] == 'stdout line 20000'
+
+
+def test_interleaved_streams_do_not_deadlock(manager, monkeypatch):
+    monkeypatch.setenv('FAKE_LOGS', 'interleaved')
+    response = get_within(manager.app.test_client(), '/api/logs/export?format=ndjson')
+
+    records = ndjson_records(response)
+    assert sum(record['stream'] == 'stderr' for record in records) == 1500
+    assert sum(record['stream'] == 'stdout' for record in records) == 6
+
+
+def test_text_format(manager, monkeypatch):
+    monkeypatch.setenv('FAKE_LOGS', 'interleaved')
+    response = get_within(manager.app.test_client(), '/api/logs/export?format=text')
+
+    lines = gzip.decompress(response.data).decode('utf-8').splitlines()
+    assert '2024-05-01T12:00:00+00:00 stdout first stdout line' in lines
+
+
+def test_invalid_since_is_rejected_before_docker_runs(manager):
+    response = manager.app.test_client().get('/api/logs/export?since=--follow')
+
+    assert response.status_code == 400
+    assert manager.recorded_calls() == []
+
+
+def test_missing_container_is_a_json_500(manager, monkeypatch):
+    monkeypatch.setenv('FAKE_LOGS', 'missing')
+    response = get_within(manager.app.test_client(), '/api/logs/export')
+
+    assert response.status_code == 500
+    assert 'No such container' in response.get_json()['error']
+
+
+def test_close_drains_buffered_lines_quickly(manager, monkeypatch):
+    monkeypatch.setenv('FAKE_LOGS', 'stdout-only')
+    logs = manager.ContainerLogs(manager.get_target())
+    next(iter(logs))
+    time.sleep(0.2)  # let the readers fill the queue
+
+    started = time.monotonic()
+    logs.close()
+    assert time.monotonic() - started < 2
+    assert not any(reader.is_alive() for reader in logs.readers)
+
+
+@pytest.mark.parametrize('line, expected', [
+    ('2024-05-01T12:00:00.123456789Z hello', ('2024-05-01T12:00:00.123456+00:00', 'hello')),
+    ('2024-05-01T12:00:00Z no fraction', ('2024-05-01T12:00:00+00:00', 'no fraction')),
+    ('2024-05-01T14:00:00.5+02:00 offset', ('2024-05-01T14:00:00.500000+02:00', 'offset')),
+    ('plain line', (None, 'plain line')),
+])
+def test_parse_log_time(manager, line, expected):
+    timestamp, message = manager.parse_log_time(line)
+    assert (timestamp.isoformat() if timestamp else None, message) == expected
+
+
+def test_gzip_chunks_round_trip_with_flushes(manager):
+    chunks = [f'line {number}\n' for number in range(5000)]
+    compressed = list(manager.gzip_chunks(chunks, flush_bytes=1024))
+
+    assert len(compressed) > 2
+    assert gzip.decompress(b''.join(compressed)).decode('utf-8') == ''.join(chunks)
+    # Each flushed prefix is already decodable, so clients can start reading early
+    assert zlib.decompressobj(31).decompress(b''.join(compressed[:2]))
@@ -0,0 +1,88 @@
+"""Request profiling: token-gated routes, 1-in-N sampling, a bounded store and both download formats."""
+import json
+import time
+
+import pytest
+
+TOKEN = 'sekrit'
+
+
+@pytest.fixture
+def manager(tmp_path, load_manager):
+    compose_file = tmp_path / 'docker-compose.yml'
+    compose_file.write_text('services:\n  decluttarr:\n    environment: []\n')
+    module = load_manager(COMPOSE_FILE=compose_file, PROFILE_TOKEN=TOKEN, PROFILE_INTERVAL_MS=1,
+                          PROFILE_SAMPLE_EVERY=3, PROFILE_MAX_STORED=2)
+
+    # A route slow enough to be sampled a few times
+    @module.app.route('/slow')
+    def slow():
+        time.sleep(0.05)
+        return 'done'
+
+    return module
+
+
+def profiles(manager):
+    response = manager.app.test_client().get('/debug/profiles', headers={'X-Profile-Token': TOKEN})
+    assert response.status_code == 200
+    return response.get_json()['profiles']
+
+
+def test_profiling_is_off_without_a_token(tmp_path, load_manager):
+    manager = load_manager(COMPOSE_FILE=tmp_path / 'docker-compose.yml', PROFILE_SAMPLE_EVERY=1)
+    client = manager.app.test_client()
+
+    assert client.get('/healthz').status_code == 200
+    assert client.get('/debug/profiles').status_code == 404
+    assert client.get('/debug/profiles/1').status_code == 404
+    assert not manager.profile_store
+
+
+def test_bad_token_is_refused(manager):
+    client = manager.app.test_client()
+
+    assert client.get('/debug/profiles').status_code == 403
+    assert client.get('/debug/profiles', headers={'X-Profile-Token': 'wrong'}).status_code == 403
+    assert client.get('/debug/profiles/1?profile=wrong').status_code == 403
+
+
+def test_one_in_n_requests_is_sampled_and_store_is_bounded(manager):
+    client = manager.app.test_client()
+    for _ in range(9):
+        client.get('/slow')
+
+    stored = profiles(manager)
+    # Requests 3, 6 and 9 were sampled; only the newest two are kept
+    assert [entry['path'] for entry in stored] == ['/slow', '/slow']
+    assert stored[0]['id'] == stored[1]['id'] + 1
+    assert all(entry['sample_count'] > 0 for entry in stored)
+
+
+def test_request_shorter_than_the_interval_is_not_stored(manager, monkeypatch):
+    monkeypatch.setattr(manager, 'PROFILE_INTERVAL_MS', 1000)
+    manager.app.test_client().get('/healthz', headers={'X-Profile-Token': TOKEN})
+    assert all(entry['path'] != '/healthz' for entry in profiles(manager))
+
+
+def test_profile_downloads(manager):
+    client = manager.app.test_client()
+    client.get('/slow', headers={'X-Profile-Token': TOKEN})
+    entry = profiles(manager)[0]
+    url = f"/debug/profiles/{entry['id']}"
+
+    speedscope = client.get(f'{url}?profile={TOKEN}')
+    assert speedscope.status_code == 200
+    document = json.loads(speedscope.data)
+    assert document['profiles'][0]['type'] == 'sampled'
+    assert len(document['profiles'][0]['samples']) == len(document['profiles'][0]['weights'])
+    assert document['shared']['frames']
+
+    collapsed = client.get(f'{url}?profile={TOKEN}&format=collapsed')
+    assert collapsed.status_code == 200
+    lines = collapsed.get_data(as_text=True).splitlines()
+    assert lines and all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+    assert any('slow (' in line for line in lines)
+
+    assert client.get(f'{url}?profile={TOKEN}&format=pprof').status_code == 400
+    assert client.get(f'/debug/profiles/999?profile={TOKEN}').status_code == 404
@@ -0,0 +1,51 @@
+"""Readiness: failed warm-up steps are retried by /readyz instead of being kept until restart."""
+import importlib
+
+
+def test_missing_compose_file_is_a_warning_and_recovers(tmp_path, load_manager):
+    compose_file = tmp_path / 'docker-compose.yml'
+    manager = load_manager(COMPOSE_FILE=compose_file)
+    client = manager.app.test_client()
+
+    response = client.get('/readyz')
+    assert response.status_code == 200
+    assert 'parse default compose file' in response.get_json()['warnings']
+
+    compose_file.write_text('services:\n  decluttarr:\n    environment: []\n')
+    response = client.get('/readyz')
+    assert response.status_code == 200
+    assert response.get_json()['warnings'] == {}
+
+
+def test_missing_optional_import_does_not_fail_readiness(tmp_path, load_manager, monkeypatch):
+    compose_file = tmp_path / 'docker-compose.yml'
+    compose_file.write_text('services:\n  decluttarr:\n    environment: []\n')
+    real_import = importlib.import_module
+
+    def import_module(name, *args):
+        if name == 'requests':
+            raise ImportError('No module named requests')
+        return real_import(name, *args)
+
+    monkeypatch.setattr(importlib, 'import_module', import_module)
+    manager = load_manager(COMPOSE_FILE=compose_file)
+
+    data = manager.app.test_client().get('/readyz').get_json()
+    assert data['ready'] is True
+    assert 'import requests' in data['warnings']
+
+
+def test_failed_required_step_is_retried(tmp_path, load_manager, monkeypatch):
+    compose_file = tmp_path / 'docker-compose.yml'
+    compose_file.write_text('services:\n  decluttarr:\n    environment: []\n')
+    manager = load_manager(COMPOSE_FILE=compose_file)
+    client = manager.app.test_client()
+
+    monkeypatch.setattr(manager, 'get_home_template', lambda: 1 / 0)
+    manager.run_warm_up_steps({'compile template'})
+    assert client.get('/readyz').status_code == 503
+
+    monkeypatch.undo()
+    response = client.get('/readyz')
+    assert response.status_code == 200
+    assert response.get_json()['errors'] == {}
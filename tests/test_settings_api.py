@@ -0,0 +1,99 @@
+"""JSON settings API: typed PATCH, ETag concurrency and refusing to answer with made-up defaults."""
+import pytest
+
+COMPOSE = '''\
+services:
+  decluttarr:
+    environment:
+    - REMOVE_TIMER=15
+    - RADARR_URL=http://radarr:7878
+'''
+
+
+@pytest.fixture
+def manager(tmp_path, load_manager):
+    compose_file = tmp_path / 'docker-compose.yml'
+    compose_file.write_text(COMPOSE)
+    module = load_manager(COMPOSE_FILE=compose_file)
+    module.compose_file = compose_file
+    return module
+
+
+def test_patch_applies_typed_batch_and_rejects_stale_etag(manager):
+    client = manager.app.test_client()
+    etag = client.get('/api/settings').headers['ETag']
+
+    response = client.patch('/api/settings', json={'REMOVE_TIMER': 20, 'REMOVE_SLOW': True}, headers={'If-Match': etag})
+    assert response.status_code == 200
+    assert response.get_json()['settings']['REMOVE_TIMER'] == 20
+    assert response.get_json()['settings']['REMOVE_SLOW'] is True
+    assert response.headers['ETag'] != etag
+
+    assert client.patch('/api/settings', json={'REMOVE_TIMER': 21}, headers={'If-Match': etag}).status_code == 412
+    assert client.get('/api/settings').get_json()['settings']['REMOVE_TIMER'] == 20
+
+
+def test_patch_rejects_invalid_values_as_a_batch(manager):
+    client = manager.app.test_client()
+    response = client.patch('/api/settings', json={'REMOVE_TIMER': 0, 'LOG_LEVEL': 'DEBUG', 'TEST_RUN': True})
+
+    assert response.status_code == 422
+    assert set(response.get_json()['errors']) == {'REMOVE_TIMER', 'LOG_LEVEL'}
+    assert client.get('/api/settings').get_json()['settings']['TEST_RUN'] is False
+
+
+def test_empty_string_is_rejected_when_it_would_revert_to_default(manager):
+    client = manager.app.test_client()
+
+    response = client.patch('/api/settings', json={'RADARR_URL': ''})
+    assert response.status_code == 422
+    assert 'RADARR_URL' in response.get_json()['errors']
+
+    # Settings whose default is empty can be cleared
+    response = client.patch('/api/settings', json={'LIDARR_URL': ''})
+    assert response.status_code == 200
+    assert response.get_json()['settings']['LIDARR_URL'] == ''
+
+
+def test_unreadable_compose_file_is_an_error_not_defaults(manager):
+    client = manager.app.test_client()
+    manager.compose_file.write_text('services: [unterminated')
+
+    assert client.get('/api/settings').status_code == 500
+    assert client.patch('/api/settings', json={'REMOVE_TIMER': 5}).status_code == 500
+
+    manager.compose_file.unlink()
+    assert client.get('/api/settings').status_code == 500
+
+
+def test_target_without_compose_file_has_no_settings(manager):
+    manager.TARGETS['docker-only'] = manager.normalize_target({'name': 'docker-only', 'compose_file': ''})
+
+    response = manager.app.test_client().get('/api/settings?target=docker-only')
+    assert response.status_code == 409
+    assert 'ETag' not in response.headers
+
+
+def test_patch_leaves_unrelated_environment_untouched(manager):
+    manager.compose_file.write_text('''\
+services:
+  decluttarr:
+    environment:
+    - TZ=Europe/London
+    - PUID=1001
+    - REMOVE_TIMER=15
+    - EXTRA_FLAG=yes
+    - LIDARR_URL=http://lidarr:8686
+''')
+    client = manager.app.test_client()
+
+    response = client.patch('/api/settings', json={'REMOVE_TIMER': 20, 'SONARR_KEY': 'abc', 'LIDARR_URL': ''})
+    assert response.status_code == 200
+
+    assert manager.read_environment_list(manager.get_target()) == [
+        'TZ=Europe/London',
+        'PUID=1001',
+        'REMOVE_TIMER=20',
+        'EXTRA_FLAG=yes',
+        'SONARR_KEY=abc',
+    ]
@@ -0,0 +1,101 @@
+"""Settings history: dedup, bounds, crash-safe pruning and recovery from a corrupt index."""
+import os
+
+import pytest
+
+
+@pytest.fixture
+def manager(tmp_path, load_manager):
+    compose_file = tmp_path / 'docker-compose.yml'
+    compose_file.write_text('services:\n  decluttarr:\n    environment:\n    - REMOVE_TIMER=15\n')
+    module = load_manager(COMPOSE_FILE=compose_file, HISTORY_MAX_VERSIONS=3)
+    module.history_path = tmp_path / '.decluttarr-history' / 'decluttarr'
+    return module
+
+
+def save_timers(manager, *timers):
+    client = manager.app.test_client()
+    for timer in timers:
+        assert client.patch('/api/settings', json={'REMOVE_TIMER': timer}).status_code == 200
+
+
+def test_history_is_deduplicated_bounded_and_diffable(manager):
+    save_timers(manager, 10, 10, 11, 12)
+    client = manager.app.test_client()
+    versions = client.get('/api/settings/history').get_json()['versions']
+
+    assert len(versions) == 3
+    assert len(os.listdir(manager.history_path / 'objects')) == 3
+    diff = client.get(f"/api/settings/history/{versions[-1]['hash'][:8]}/diff/{versions[0]['hash'][:8]}").get_json()
+    assert diff['changed'] == {'REMOVE_TIMER': {'from': '10', 'to': '12'}}
+
+
+def test_failed_index_write_does_not_delete_referenced_objects(manager, monkeypatch):
+    save_timers(manager, 10, 11, 12)
+    objects_before = set(os.listdir(manager.history_path / 'objects'))
+
+    def failing_write(path, data):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(manager, 'write_file_atomic', failing_write)
+    save_timers(manager, 13)  # the compose write succeeds; only history recording fails
+
+    index = manager.load_history_index(manager.get_target())
+    assert {f"{entry['hash']}.json" for entry in index} <= objects_before
+    assert set(os.listdir(manager.history_path / 'objects')) == objects_before
+
+
+def test_corrupt_index_is_rebuilt_from_objects(manager):
+    save_timers(manager, 10, 11)
+    (manager.history_path / 'index.json').write_text('{not json')
+
+    response = manager.app.test_client().get('/api/settings/history')
+    assert response.status_code == 200
+    # The original environment plus the two saves
+    assert len(response.get_json()['versions']) == 3
+    assert (manager.history_path / 'index.json.corrupt').exists()
+
+    save_timers(manager, 12)
+    versions = manager.app.test_client().get('/api/settings/history').get_json()['versions']
+    assert len(versions) == 3
+    current = manager.app.test_client().get(f"/api/settings/history/{versions[0]['hash']}").get_json()
+    assert 'REMOVE_TIMER=12' in current['environment']
+
+
+def test_history_needs_a_compose_file(manager):
+    manager.TARGETS['docker-only'] = manager.normalize_target({'name': 'docker-only', 'compose_file': ''})
+
+    response = manager.app.test_client().get('/api/settings/history?target=docker-only')
+    assert response.status_code == 400
+
+
+def test_rollback_restores_environment_and_recreates(manager, fake_docker):
+    recorded_calls = fake_docker('')
+    save_timers(manager, 10)
+    client = manager.app.test_client()
+    versions = client.get('/api/settings/history').get_json()['versions']
+
+    response = client.post(f"/api/settings/history/{versions[1]['hash'][:8]}/rollback")
+    assert response.status_code == 200
+    assert manager.read_environment_list(manager.get_target()) == ['REMOVE_TIMER=15']
+    assert [args.split(' ')[-2:] for host, args in recorded_calls()] == [
+        ['stop', 'decluttarr'], ['-f', 'decluttarr'], ['-d', 'decluttarr'],
+    ]
+    # The rollback is itself a new version at the head of the history
+    after = client.get('/api/settings/history').get_json()['versions']
+    assert len(after) == len(versions) + 1
+    assert after[0]['hash'] == versions[1]['hash'] and after[0]['current']
+
+
+def test_mapping_style_environment_is_snapshotted_as_a_list(manager):
+    (manager.history_path.parent.parent / 'docker-compose.yml').write_text(
+        'services:\n  decluttarr:\n    environment:\n      REMOVE_TIMER: 15\n      EXTRA_FLAG:\n'
+    )
+    save_timers(manager, 10)
+    client = manager.app.test_client()
+    versions = client.get('/api/settings/history').get_json()['versions']
+
+    original = client.get(f"/api/settings/history/{versions[-1]['hash']}").get_json()
+    assert original['environment'] == ['REMOVE_TIMER=15', 'EXTRA_FLAG']
+    diff = client.get(f"/api/settings/history/{versions[-1]['hash']}/diff/{versions[0]['hash']}").get_json()
+    assert diff['changed'] == {'REMOVE_TIMER': {'from': '15', 'to': '10'}}
@@ -0,0 +1,129 @@
+"""Multi-target fan-out against a fake `docker` CLI that records which endpoint it was sent to."""
+import os
+import textwrap
+import time
+
+import pytest
+
+FAKE_DOCKER = '''\
+case "$DOCKER_HOST" in
+  *slow.sock) exec sleep 10;;
+  *broken.sock) echo "Cannot connect to the Docker daemon at $DOCKER_HOST" >&2; exit 1;;
+esac
+case "$1" in
+  ps) case "$DOCKER_HOST" in *4k.sock) echo "Up 3 hours";; esac;;
+  logs) if [ "$FAKE_LOGS" = bulk ]; then
+          # Thousands of stdout-only lines: more than the reader queue holds
+          seq 1 5000 | sed "s|^|2024-05-01T12:00:00Z needle $DOCKER_HOST |"
+          exit 0
+        fi
+        case "$DOCKER_HOST" in *4k.sock) second=03;; *) second=02;; esac
+        echo "2024-05-01T12:00:${second}Z needle from $DOCKER_HOST"
+        echo "2024-05-01T12:00:00Z haystack" >&2;;
+esac
+'''
+
+
+@pytest.fixture
+def manager(tmp_path, load_manager, fake_docker):
+    """Load the manager with four targets, each on its own fake Docker socket"""
+    recorded_calls = fake_docker(FAKE_DOCKER)
+
+    targets = []
+    for name, timeout in (('4k', 5), ('anime', 5), ('slow', 1), ('broken', 5)):
+        compose_dir = tmp_path / name
+        compose_dir.mkdir()
+        (compose_dir / 'docker-compose.yml').write_text('services:\n  decluttarr:\n    environment: []\n')
+        targets.append(textwrap.dedent(f'''\
+            - name: {name}
+              compose_file: {compose_dir / 'docker-compose.yml'}
+              docker_host: unix://{tmp_path / name}.sock
+              timeout: {timeout}
+            '''))
+    registry = tmp_path / 'targets.yml'
+    registry.write_text(''.join(targets))
+
+    module = load_manager(DECLUTTARR_TARGETS=registry)
+    module.recorded_calls = recorded_calls
+    return module
+
+
+def hosts_for(calls, command):
+    return {os.path.basename(host) for host, args in calls if args.startswith(command)}
+
+
+def test_status_board_fans_out_to_every_socket(manager):
+    started = time.monotonic()
+    data = manager.app.test_client().get('/api/targets/status').get_json()
+    elapsed = time.monotonic() - started
+
+    assert data['targets']['4k'] == {'success': True, 'status': 'running'}
+    assert data['targets']['anime'] == {'success': True, 'status': 'stopped'}
+    assert data['targets']['slow'] == {'success': False, 'error': 'Timed out after 1s'}
+    assert data['targets']['broken']['success'] is True  # `docker ps` output is empty, not an error
+    assert data['summary'] == {'running': 1, 'stopped': 2, 'unknown': 1}
+    assert hosts_for(manager.recorded_calls(), 'ps') == {'4k.sock', 'anime.sock', 'slow.sock', 'broken.sock'}
+    # Targets run concurrently, so the slow one does not delay the rest
+    assert elapsed < 3
+
+
+def test_lifecycle_action_uses_one_deadline_per_target(manager):
+    response = manager.app.test_client().post('/api/targets/container/restart')
+    data = response.get_json()['targets']
+
+    assert response.status_code == 502
+    assert data['4k'] == {'success': True}
+    assert data['anime'] == {'success': True}
+    assert data['slow'] == {'success': False, 'error': 'Timed out after 1s'}
+    assert data['broken']['error'].startswith('Docker error')
+    calls = manager.recorded_calls()
+    assert hosts_for(calls, 'compose') == {'4k.sock', 'anime.sock', 'slow.sock', 'broken.sock'}
+    # The slow target's stop used up its whole budget, so `up` was never attempted
+    assert not [args for host, args in calls if host.endswith('slow.sock') and ' up ' in f' {args} ']
+
+
+def test_action_can_select_targets(manager):
+    response = manager.app.test_client().post('/api/targets/container/stop?targets=4k,anime')
+
+    assert response.status_code == 200
+    assert set(response.get_json()['targets']) == {'4k', 'anime'}
+    assert hosts_for(manager.recorded_calls(), 'compose') == {'4k.sock', 'anime.sock'}
+
+
+def test_log_search_merges_matches_and_reports_errors(manager):
+    data = manager.app.test_client().get('/api/targets/logs/search?q=needle').get_json()
+
+    # Merged by timestamp across targets, not in registry order
+    assert [(record['target'], record['timestamp']) for record in data['matches']] == [
+        ('anime', '2024-05-01T12:00:02+00:00'),
+        ('4k', '2024-05-01T12:00:03+00:00'),
+    ]
+    assert data['errors']['slow'] == 'Timed out after 1s'
+    assert 'Cannot connect' in data['errors']['broken']
+    assert hosts_for(manager.recorded_calls(), 'logs') == {'4k.sock', 'anime.sock', 'slow.sock', 'broken.sock'}
+
+
+@pytest.mark.parametrize('limit', ['0', '-1', 'abc'])
+def test_log_search_rejects_bad_limit(manager, limit):
+    response = manager.app.test_client().get(f'/api/targets/logs/search?q=x&limit={limit}')
+
+    assert response.status_code == 400
+    assert manager.recorded_calls() == []
+
+
+def test_log_search_clamps_limit(manager):
+    data = manager.app.test_client().get('/api/targets/logs/search?q=needle&limit=999999&targets=4k').get_json()
+
+    assert data['limit'] == manager.LOG_SEARCH_MAX_LIMIT
+
+
+def test_log_search_over_large_single_stream_range(manager, monkeypatch):
+    monkeypatch.setenv('FAKE_LOGS', 'bulk')
+    started = time.monotonic()
+    data = manager.app.test_client().get('/api/targets/logs/search?q=needle&limit=3000&targets=4k,anime').get_json()
+
+    assert data['errors'] == {}
+    assert len(data['matches']) == 3000
+    assert {record['target'] for record in data['matches']} <= {'4k', 'anime'}
+    # Well inside the 5s per-target timeout; a stalled reader would use all of it
+    assert time.monotonic() - started < 4